@@ -1,8 +1,12 @@
 """
 Agent definitions for the Financial Advisor AI Gateway Demo.
 This module contains the specialized agents for different financial services.
+Agent factories are memoized, so each agent is constructed once per process and
+shared by every session. Per-request mutable state such as the conversation
+history must live outside the agent instances.
 """
 
+from functools import cache
 from google.adk.agents import Agent, LlmAgent
 from google.adk.tools import google_search
 from tools.financial_tools import (
@@ -10,9 +14,65 @@ from tools.financial_tools import (
     calculate_investment_returns,
     fetch_stock_price,
     calculate_mortgage_payment,
-    get_exchange_rate
+    get_exchange_rate,
+    get_exchange_rates_batch
 )
 
+# Agent instructions
+_INVESTMENT_INSTRUCTION = """
+        You are a Financial Investment Advisor. Your responsibilities include:
+        
+        1. Providing investment advice based on user goals and risk tolerance
+        2. Analyzing portfolio allocations and suggesting optimizations
+        3. Explaining investment concepts and market trends
+        4. Using financial tools to calculate investment returns
+        5. Providing factual information about stocks and market data
+        
+        Be professional, thorough, and consider long-term investment horizons.
+        Always clarify that you're providing educational information, not financial advice.
+        """
+
+_LOAN_INSTRUCTION = """
+        You are a Loan Specialist. Your responsibilities include:
+        
+        1. Calculating loan payments and amortization schedules
+        2. Explaining different financing options and their pros/cons
+        3. Providing mortgage information and calculations
+        4. Explaining loan concepts (interest rates, APR, fees)
+        5. Helping compare different loan options
+        
+        Be concise, accurate, and educational in your responses.
+        Always clarify that you're providing educational information, not financial advice.
+        """
+
+_CUSTOMER_SERVICE_INSTRUCTION = """
+        You are a Financial Customer Service Representative. Your responsibilities include:
+        
+        1. Answering general banking questions
+        2. Explaining account features and services
+        3. Providing guidance on typical banking procedures
+        4. Directing users to appropriate resources
+        5. Offering friendly, patient assistance
+        
+        Be empathetic, clear, and helpful. Use simple language and avoid jargon.
+        Never request or provide access to real accounts.
+        """
+
+_COORDINATOR_INSTRUCTION = """
+            You are a Financial Services Coordinator. Your job is to:
+            1. Understand user financial questions
+            2. Route them to the appropriate specialized agent
+            3. Handle general queries directly 
+            
+            You have these specialized agents:
+            - Investment Agent: For stock market, portfolio management, and investment strategy questions
+            - Loan Agent: For loan calculations, mortgage queries, and financing options
+            - Customer Service Agent: For account issues, general banking questions, and service inquiries
+            
+            Only route to specialized agents when necessary. Handle simple queries yourself.
+            """
+
+@cache
 def create_investment_agent():
     """
     Creates an agent specialized in investment advice.
@@ -24,18 +84,7 @@ def create_investment_agent():
         name="investment_advisor",
         model="gemini-2.0-pro",
         description="Provides investment advice and portfolio management guidance",
-        instruction="""
-        You are a Financial Investment Advisor. Your responsibilities include:
-        
-        1. Providing investment advice based on user goals and risk tolerance
-        2. Analyzing portfolio allocations and suggesting optimizations
-        3. Explaining investment concepts and market trends
-        4. Using financial tools to calculate investment returns
-        5. Providing factual information about stocks and market data
-        
-        Be professional, thorough, and consider long-term investment horizons.
-        Always clarify that you're providing educational information, not financial advice.
-        """,
+        instruction=_INVESTMENT_INSTRUCTION,
         tools=[
             calculate_investment_returns,
             fetch_stock_price,
@@ -43,6 +92,7 @@ def create_investment_agent():
         ]
     )
 
+@cache
 def create_loan_agent():
     """
     Creates an agent specialized in loan calculations and financing.
@@ -54,25 +104,16 @@ def create_loan_agent():
         name="loan_specialist",
         model="gemini-2.0-pro",
         description="Provides loan calculations and financing information",
-        instruction="""
-        You are a Loan Specialist. Your responsibilities include:
-        
-        1. Calculating loan payments and amortization schedules
-        2. Explaining different financing options and their pros/cons
-        3. Providing mortgage information and calculations
-        4. Explaining loan concepts (interest rates, APR, fees)
-        5. Helping compare different loan options
-        
-        Be concise, accurate, and educational in your responses.
-        Always clarify that you're providing educational information, not financial advice.
-        """,
+        instruction=_LOAN_INSTRUCTION,
         tools=[
             calculate_loan_payment,
             calculate_mortgage_payment,
-            get_exchange_rate
+            get_exchange_rate,
+            get_exchange_rates_batch
         ]
     )
 
+@cache
 def create_customer_service_agent():
     """
     Creates an agent specialized in customer service for banking.
@@ -84,19 +125,28 @@ def create_customer_service_agent():
         name="customer_service",
         model="gemini-2.0-pro",
         description="Assists with general banking questions and customer service",
-        instruction="""
-        You are a Financial Customer Service Representative. Your responsibilities include:
-        
-        1. Answering general banking questions
-        2. Explaining account features and services
-        3. Providing guidance on typical banking procedures
-        4. Directing users to appropriate resources
-        5. Offering friendly, patient assistance
-        
-        Be empathetic, clear, and helpful. Use simple language and avoid jargon.
-        Never request or provide access to real accounts.
-        """,
+        instruction=_CUSTOMER_SERVICE_INSTRUCTION,
         tools=[
             google_search
         ]
     )
+
+@cache
+def get_coordinator():
+    """
+    Returns the process-wide coordinator agent that routes queries to the specialized agents.
+    
+    Returns:
+        Agent: The shared financial coordinator agent
+    """
+    return LlmAgent(
+        name="financial_coordinator",
+        model="gemini-2.0-pro",
+        description="Coordinates financial advisor services by routing queries to specialized agents",
+        instruction=_COORDINATOR_INSTRUCTION,
+        sub_agents=[
+            create_investment_agent(),
+            create_loan_agent(),
+            create_customer_service_agent()
+        ]
+    )
@@ -6,15 +6,11 @@ This script initializes and starts all the financial advisor agents.
 
 import os
 import sys
-import time
+import signal
+import threading
 import logging
 from dotenv import load_dotenv
-from google.adk.agents import Agent, LlmAgent
-from agent_definitions import (
-    create_investment_agent,
-    create_loan_agent,
-    create_customer_service_agent
-)
+from agent_definitions import get_coordinator
 
 # Set up logging
 logging.basicConfig(
@@ -33,45 +29,20 @@ def main():
     """Initialize and start all agents"""
     logger.info("Starting Financial Advisor AI Gateway Demo Agents")
     
+    # Stop on SIGINT/SIGTERM; installed first so Ctrl+C during startup also shuts down cleanly
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    
     try:
-        # Create the agents
-        investment_agent = create_investment_agent()
-        loan_agent = create_loan_agent()
-        customer_service_agent = create_customer_service_agent()
-        
-        # Create a parent coordinator agent
-        coordinator = LlmAgent(
-            name="financial_coordinator",
-            model="gemini-2.0-pro",
-            description="Coordinates financial advisor services by routing queries to specialized agents",
-            instruction="""
-            You are a Financial Services Coordinator. Your job is to:
-            1. Understand user financial questions
-            2. Route them to the appropriate specialized agent
-            3. Handle general queries directly 
-            
-            You have these specialized agents:
-            - Investment Agent: For stock market, portfolio management, and investment strategy questions
-            - Loan Agent: For loan calculations, mortgage queries, and financing options
-            - Customer Service Agent: For account issues, general banking questions, and service inquiries
-            
-            Only route to specialized agents when necessary. Handle simple queries yourself.
-            """,
-            sub_agents=[
-                investment_agent,
-                loan_agent,
-                customer_service_agent
-            ]
-        )
+        # Create the parent coordinator agent and its specialized sub-agents
+        coordinator = get_coordinator()
         
         logger.info("All agents started successfully")
         
-        # Keep the service running
-        while True:
-            logger.info("Agents running... (Ctrl+C to quit)")
-            time.sleep(60)
-            
-    except KeyboardInterrupt:
+        # Keep the service running until SIGINT/SIGTERM
+        logger.info("Agents running... (Ctrl+C to quit)")
+        stop.wait()
         logger.info("Shutting down agents")
     except Exception as e:
         logger.error(f"Error starting agents: {str(e)}")
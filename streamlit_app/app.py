@@ -1,12 +1,17 @@
 import streamlit as st
-import requests
-import json
+import asyncio
+import httpx
+import nest_asyncio
+import orjson
 import os
-import plotly.graph_objects as go
-import pandas as pd
 from dotenv import load_dotenv
 import time
 from datetime import datetime
+from collections import Counter, deque
+from itertools import islice
+
+from response_cache import UNCACHED_DEMO_MODES, response_cache_key
+from ui_constants import CUSTOM_CSS, LOCAL_MODELS, OLLAMA_MODELS, ROUTE_TABLE, LOGO_DATA_URI
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +20,35 @@ load_dotenv()
 GATEWAY_URL = os.getenv("GATEWAY_URL", "http://localhost:9000")
 API_KEY = os.getenv("API_KEY", "demo-key")
 
+GATEWAY_HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {API_KEY}"
+}
+
+# Size of the pooled connection set shared by all gateway calls in a session
+MAX_CONNECTIONS = 10
+
+# Maximum number of gateway calls in flight at once, so fan-outs stay under the gateway rate limits
+MAX_PARALLEL_REQUESTS = 8
+
+# Query types that get a copy of the question when fanning out to all specialists
+SPECIALIST_QUERY_TYPES = ["Investment Advice", "Loan Calculator", "Customer Service"]
+
+# Demo features that render Plotly charts
+CHART_MODES = ("Token Usage", "Latency Metrics", "Request Tracing")
+
+# Columns recorded for every gateway request
+HISTORY_COLUMNS = ("timestamp", "request_type", "model", "deployment", "latency", "input_tokens", "output_tokens")
+
+# Default number of chat messages and history rows kept in a session
+DEFAULT_MAX_HISTORY = 200
+
+# Number of most recent chat messages rendered on each rerun
+RENDERED_MESSAGES = 50
+
+# Number of gateway responses kept for repeated questions
+RESPONSE_CACHE_SIZE = 256
+
 # Page configuration
 st.set_page_config(
     page_title="Financial Advisor AI Gateway Demo",
@@ -24,75 +58,341 @@ st.set_page_config(
 )
 
 # Apply custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E3A8A;
-    }
-    .subheader {
-        font-size: 1.5rem;
-        color: #3B82F6;
-    }
-    .feature-card {
-        background-color: #F3F4F6;
-        border-radius: 10px;
-        padding: 20px;
-        margin-bottom: 20px;
-    }
-    .chat-message {
-        padding: 15px;
-        border-radius: 10px;
-        margin-bottom: 10px;
-    }
-    .user-message {
-        background-color: #E2E8F0;
-    }
-    .ai-message {
-        background-color: #DBEAFE;
-    }
-    .info-box {
-        background-color: #FEF3C7;
-        padding: 10px;
-        border-radius: 5px;
-        border-left: 5px solid #F59E0B;
-        margin-bottom: 20px;
-    }
-    .model-tag {
-        background-color: #E0F2FE;
-        padding: 2px 6px;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        margin-right: 5px;
-    }
-    .local-model-tag {
-        background-color: #DCFCE7;
-        padding: 2px 6px;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        margin-right: 5px;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=DEFAULT_MAX_HISTORY)
 
 if "token_usage" not in st.session_state:
     st.session_state.token_usage = {"input": 0, "output": 0}
 
-if "request_history" not in st.session_state:
-    # Store timestamp, request_type, model, latency, tokens
-    st.session_state.request_history = []
+if "history_cols" not in st.session_state:
+    # Request history stored column-wise so charts can use the columns directly
+    st.session_state.history_cols = {name: deque(maxlen=DEFAULT_MAX_HISTORY) for name in HISTORY_COLUMNS}
+
+if "request_total" not in st.session_state:
+    # Requests recorded since the last clear, including rows already evicted from history
+    st.session_state.request_total = 0
+
+if "charts" not in st.session_state:
+    st.session_state.charts = None
+
+if "history_frame" not in st.session_state:
+    st.session_state.history_frame = None
 
 if "last_route" not in st.session_state:
     st.session_state.last_route = None
 
+if "resp_cache" not in st.session_state:
+    # Maps a normalized query key to (response, model, usage)
+    st.session_state.resp_cache = {}
+
+if "event_loop" not in st.session_state:
+    # A long-lived loop per session so the pooled HTTP client stays usable across reruns
+    st.session_state.event_loop = asyncio.new_event_loop()
+    nest_asyncio.apply(st.session_state.event_loop)
+
+if "request_semaphore" not in st.session_state:
+    # Created on first use inside the event loop it guards
+    st.session_state.request_semaphore = None
+
+if "http_client" not in st.session_state:
+    # Shared client keeps gateway connections alive between requests
+    st.session_state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=60.0,
+        headers=GATEWAY_HEADERS,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    )
+
+# Response cache helpers
+def cache_response(key, response_text, model, usage):
+    """Store a gateway response, evicting the oldest entry when the cache is full"""
+    cache = st.session_state.resp_cache
+    if key not in cache and len(cache) >= RESPONSE_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = (response_text, model, usage)
+
+# Request history helpers
+def append_history(**row):
+    """Append one request to the column-wise request history"""
+    history = st.session_state.history_cols
+    for name in HISTORY_COLUMNS:
+        history[name].append(row[name])
+    st.session_state.request_total += 1
+
+def resize_history(max_history):
+    """Change how many chat messages and history rows are kept, dropping the oldest ones"""
+    if st.session_state.messages.maxlen != max_history:
+        st.session_state.messages = deque(st.session_state.messages, maxlen=max_history)
+        st.session_state.history_cols = {
+            name: deque(column, maxlen=max_history)
+            for name, column in st.session_state.history_cols.items()
+        }
+        # Cached views are rebuilt from the resized history on next use
+        st.session_state.charts = None
+        st.session_state.history_frame = None
+
+def tail(column, count):
+    """Return the last `count` entries of a history column as a tuple"""
+    return tuple(islice(column, max(0, len(column) - count), None))
+
+def history_frame():
+    """Return the request history as a DataFrame, rebuilt only when new requests are recorded"""
+    import pandas as pd
+    
+    total = st.session_state.request_total
+    if st.session_state.history_frame is None or st.session_state.history_frame[0] != total:
+        frame = pd.DataFrame({name: list(column) for name, column in st.session_state.history_cols.items()})
+        st.session_state.history_frame = (total, frame)
+    return st.session_state.history_frame[1]
+
+# Metrics chart helpers
+def build_metric_charts():
+    """Create empty token usage and latency figures that are extended as requests arrive"""
+    # Plotly is only imported once a chart is shown, keeping it off the first page load
+    import plotly.graph_objects as go
+    
+    tokens_fig = go.Figure()
+    tokens_fig.add_trace(go.Bar(
+        x=[],
+        y=[],
+        name="Input Tokens",
+        marker_color='#3B82F6'
+    ))
+    tokens_fig.add_trace(go.Bar(
+        x=[],
+        y=[],
+        name="Output Tokens",
+        marker_color='#10B981'
+    ))
+    
+    tokens_fig.update_layout(
+        barmode='group',
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    
+    latency_fig = go.Figure()
+    latency_fig.add_trace(go.Scatter(
+        x=[],
+        y=[],
+        mode='lines+markers',
+        name="Latency (s)",
+        marker_color='#F59E0B'
+    ))
+    
+    latency_fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        yaxis_title="Seconds",
+    )
+    
+    return {"tokens": tokens_fig, "latency": latency_fig, "rows": 0, "routing": None, "routing_rows": 0}
+
+def build_routing_charts(history):
+    """Create the deployment and request type pie charts from the request history"""
+    import plotly.graph_objects as go
+    
+    # Add deployment visualization
+    deployment_counts = Counter(history["deployment"]).most_common()
+    
+    deployment_fig = go.Figure(data=[go.Pie(
+        labels=[deployment for deployment, _ in deployment_counts],
+        values=[count for _, count in deployment_counts],
+        hole=.4,
+        marker_colors=['#10B981', '#3B82F6']
+    )])
+    
+    deployment_fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        title="Cloud vs Local Deployments"
+    )
+    
+    # Count request types
+    request_counts = Counter(history["request_type"]).most_common()
+    
+    request_fig = go.Figure(data=[go.Pie(
+        labels=[request_type for request_type, _ in request_counts],
+        values=[count for _, count in request_counts],
+        hole=.4,
+        marker_colors=['#3B82F6', '#10B981', '#F59E0B', '#EF4444']
+    )])
+    
+    request_fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        title="Request Types"
+    )
+    
+    return deployment_fig, request_fig
+
+def sync_charts():
+    """Bring the cached figures up to date, pushing only requests recorded since the last sync"""
+    if st.session_state.charts is None:
+        st.session_state.charts = build_metric_charts()
+    
+    charts = st.session_state.charts
+    history = st.session_state.history_cols
+    new_rows = st.session_state.request_total - charts["rows"]
+    
+    if new_rows > 0:
+        # Plotly data arrays are tuples, so new points are added by tuple extension
+        timestamps = tail(history["timestamp"], new_rows)
+        input_trace, output_trace = charts["tokens"].data
+        input_trace.x += timestamps
+        input_trace.y += tail(history["input_tokens"], new_rows)
+        output_trace.x += timestamps
+        output_trace.y += tail(history["output_tokens"], new_rows)
+        
+        latency_trace = charts["latency"].data[0]
+        latency_trace.x += timestamps
+        latency_trace.y += tail(history["latency"], new_rows)
+        
+        # Drop points that have been evicted from the history
+        max_points = history["timestamp"].maxlen
+        for trace in (input_trace, output_trace, latency_trace):
+            if len(trace.x) > max_points:
+                trace.x = trace.x[-max_points:]
+                trace.y = trace.y[-max_points:]
+        
+        charts["rows"] = st.session_state.request_total
+    
+    return charts
+
+def routing_charts(charts):
+    """Return the pie charts, rebuilding them only when new requests have been recorded"""
+    if charts["routing"] is None or charts["routing_rows"] != charts["rows"]:
+        charts["routing"] = build_routing_charts(st.session_state.history_cols)
+        charts["routing_rows"] = charts["rows"]
+    return charts["routing"]
+
+# Chat helpers
+def render_message(message):
+    """Render a single chat message, tagging assistant replies with the model that produced them"""
+    with st.chat_message(message["role"]):
+        if message["role"] == "user":
+            st.markdown(message["content"])
+        else:
+            # Check if model info is available to display model tag
+            model_tag = ""
+            if "model" in message:
+                tag_class = "local-model-tag" if message["model"] in LOCAL_MODELS else "model-tag"
+                model_label = f'{message["model"]} (cached)' if message.get("cached") else message["model"]
+                model_tag = f'<span class="{tag_class}">{model_label}</span>'
+            
+            st.markdown(f'{model_tag}{message["content"]}', unsafe_allow_html=True)
+
+def add_message(message):
+    """Append a new message to the chat history and render it below the existing ones"""
+    st.session_state.messages.append(message)
+    with chat_container:
+        render_message(message)
+
+# Gateway request helpers
+async def call_route(client, semaphore, route, payload):
+    """
+    POST a payload to a single gateway route.
+    
+    Returns the response (or the exception that prevented one) with its latency,
+    so one failed call does not abort the others running alongside it.
+    """
+    async with semaphore:
+        start_time = time.time()
+        try:
+            response = await client.post(
+                f"{GATEWAY_URL}{route}",
+                content=orjson.dumps(payload)
+            )
+        except Exception as e:
+            return e, time.time() - start_time
+        return response, time.time() - start_time
+
+async def dispatch_routes(routes, payload):
+    """Send the same payload to several gateway routes concurrently"""
+    if st.session_state.request_semaphore is None:
+        st.session_state.request_semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+    
+    semaphore = st.session_state.request_semaphore
+    client = st.session_state.http_client
+    return await asyncio.gather(
+        *(call_route(client, semaphore, route, payload) for route in routes)
+    )
+
+def decode_result(response):
+    """Decode a gateway response body, raising if it does not carry a response field"""
+    result = orjson.loads(response.content)
+    if not isinstance(result, dict) or "response" not in result:
+        raise ValueError("gateway returned a malformed response")
+    return result
+
+def record_success(request_type, deployment, result, latency, cache_key=None):
+    """Append a successful gateway result to the chat and request history"""
+    # Extract metrics
+    token_usage = result.get("usage", {"input_tokens": 0, "output_tokens": 0})
+    st.session_state.token_usage["input"] += token_usage.get("input_tokens", 0)
+    st.session_state.token_usage["output"] += token_usage.get("output_tokens", 0)
+    
+    # Add response to chat
+    assistant_message = {
+        "role": "assistant", 
+        "content": result["response"],
+        "model": result.get("model", "unknown")
+    }
+    add_message(assistant_message)
+    
+    if cache_key is not None:
+        cache_response(cache_key, result["response"], assistant_message["model"], token_usage)
+    
+    # Record request history
+    append_history(
+        timestamp=datetime.now().strftime("%H:%M:%S"),
+        request_type=request_type,
+        model=result.get("model", "unknown"),
+        deployment=deployment,
+        latency=round(latency, 2),
+        input_tokens=token_usage.get("input_tokens", 0),
+        output_tokens=token_usage.get("output_tokens", 0)
+    )
+
+def record_error(request_type, deployment, error_msg, latency):
+    """Append a failed gateway request to the chat and request history"""
+    add_message({"role": "assistant", "content": error_msg})
+    
+    # Record error in history
+    append_history(
+        timestamp=datetime.now().strftime("%H:%M:%S"),
+        request_type=request_type,
+        model="error",
+        deployment=deployment,
+        latency=round(latency, 2),
+        input_tokens=0,
+        output_tokens=0
+    )
+
+def record_response(request_type, deployment, result, cache_key=None):
+    """Append a gateway response (or failure) to the chat and request history"""
+    response, latency = result
+    
+    if isinstance(response, Exception):
+        record_error(request_type, deployment, f"Connection error: {str(response)}", latency)
+    elif response.status_code == 200:
+        try:
+            decoded = decode_result(response)
+        except Exception as e:
+            record_error(request_type, deployment, f"Connection error: {str(e)}", latency)
+        else:
+            record_success(request_type, deployment, decoded, latency, cache_key)
+    else:
+        record_error(request_type, deployment, f"Error: {response.status_code} - {response.text}", latency)
+
 # Sidebar
 with st.sidebar:
     st.markdown("## Financial Advisor Demo")
-    st.image("https://via.placeholder.com/150x150.png?text=AI+Gateway", width=150)
+    st.markdown(f'<img src="{LOGO_DATA_URI}" width="150" alt="AI Gateway"/>', unsafe_allow_html=True)
     
     st.markdown("### Configure Demo")
     
@@ -110,29 +410,23 @@ with st.sidebar:
         ["Investment Advice", "Loan Calculator", "Customer Service", "General Query"]
     )
     
-    # Map query type to API routes based on deployment choice
-    route_mapping = {}
+    use_cache = st.checkbox(
+        "Cache repeated questions",
+        value=True,
+        help="Answer repeated questions from a local cache instead of calling the gateway again (bypassed while Rate Limiting, Model Fallback or Latency Metrics is demonstrated)"
+    )
     
-    if model_deployment == "Cloud APIs":
-        route_mapping = {
-            "Investment Advice": "/v1/investment",
-            "Loan Calculator": "/v1/loan",
-            "Customer Service": "/v1/customer",
-            "General Query": "/v1/general"
-        }
-    else:  # Local (Ollama)
-        route_mapping = {
-            "Investment Advice": "/v1/investment-local",
-            "Loan Calculator": "/v1/loan-local",
-            "Customer Service": "/v1/customer-local",
-            "General Query": "/v1/general"
-        }
+    fan_out = st.checkbox(
+        "Ask all specialists",
+        value=False,
+        help="Send the question to the investment, loan and customer service routes in parallel"
+    )
     
     # Local model selection when Ollama is selected
     if model_deployment == "Local (Ollama)":
         local_model = st.selectbox(
             "Select local model",
-            ["llama3-8b", "mistral-7b", "phi-2", "codellama-7b", "solar-10.7b"],
+            OLLAMA_MODELS,
             index=0,
             help="Choose which Ollama model to use locally"
         )
@@ -154,16 +448,33 @@ with st.sidebar:
         default=["Token Usage", "Latency Metrics"]
     )
     
+    if use_cache and not UNCACHED_DEMO_MODES.isdisjoint(demo_modes):
+        bypassing_modes = ", ".join(sorted(UNCACHED_DEMO_MODES.intersection(demo_modes)))
+        st.caption(f"Cached answers are not used while demonstrating {bypassing_modes}.")
+    
+    max_history = st.number_input(
+        "Messages kept in history",
+        min_value=RENDERED_MESSAGES,
+        max_value=1000,
+        value=DEFAULT_MAX_HISTORY,
+        step=50,
+        help="Older chat messages and request history rows are dropped beyond this limit"
+    )
+    resize_history(max_history)
+    
     st.markdown("### Stats")
-    st.metric("Input Tokens Used", st.session_state.token_usage["input"])
-    st.metric("Output Tokens Used", st.session_state.token_usage["output"])
+    # Filled in at the end of the run so the totals include this run's requests
+    stats_container = st.container()
     
     if st.button("Clear Chat"):
-        st.session_state.messages = []
+        st.session_state.messages = deque(maxlen=max_history)
         st.session_state.token_usage = {"input": 0, "output": 0}
-        st.session_state.request_history = []
+        st.session_state.history_cols = {name: deque(maxlen=max_history) for name in HISTORY_COLUMNS}
+        st.session_state.request_total = 0
+        st.session_state.charts = None
+        st.session_state.history_frame = None
         st.session_state.last_route = None
-        st.experimental_rerun()
+        st.rerun()
 
 # Main content
 st.markdown('<p class="main-header">Financial Advisor AI Gateway Demo</p>', unsafe_allow_html=True)
@@ -185,30 +496,26 @@ col1, col2 = st.columns([2, 1])
 with col1:
     st.markdown('<p class="subheader">Chat with your Financial Advisor</p>', unsafe_allow_html=True)
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        if message["role"] == "user":
-            st.markdown(f'<div class="chat-message user-message">{message["content"]}</div>', unsafe_allow_html=True)
-        else:
-            # Check if model info is available to display model tag
-            model_tag = ""
-            if "model" in message:
-                tag_class = "local-model-tag" if "llama" in message["model"] or "mistral" in message["model"] or "phi" in message["model"] else "model-tag"
-                model_tag = f'<span class="{tag_class}">{message["model"]}</span>'
-            
-            st.markdown(f'<div class="chat-message ai-message">{model_tag}{message["content"]}</div>', unsafe_allow_html=True)
-    
-    # Chat input
-    user_query = st.text_input("Ask a financial question:", key="user_input")
+    # Display the most recent chat messages; older ones stay in session state
+    chat_container = st.container()
+    messages = st.session_state.messages
+    with chat_container:
+        for message in islice(messages, max(0, len(messages) - RENDERED_MESSAGES), None):
+            render_message(message)
     
-    if user_query:
+    # Chat input; new messages are rendered in place, so no forced rerun is needed
+    if user_query := st.chat_input("Ask a financial question:"):
         # Add user message to chat
-        st.session_state.messages.append({"role": "user", "content": user_query})
+        add_message({"role": "user", "content": user_query})
         
         # Prepare request based on query type
-        current_route = route_mapping[query_type]
+        current_route = ROUTE_TABLE[(model_deployment, query_type)]
         st.session_state.last_route = current_route
         
+        # Fan out to every specialist route, or just the selected one
+        request_types = SPECIALIST_QUERY_TYPES if fan_out else [query_type]
+        routes = [ROUTE_TABLE[(model_deployment, request_type)] for request_type in request_types]
+        
         # Prepare payload
         payload = {
             "prompt": user_query, 
@@ -219,173 +526,75 @@ with col1:
         if model_deployment == "Local (Ollama)":
             payload["model"] = local_model
         
-        # Record start time for latency tracking
-        start_time = time.time()
+        deployment = "Local" if model_deployment == "Local (Ollama)" else "Cloud"
         
-        try:
-            # Make request to AI Gateway
-            response = requests.post(
-                f"{GATEWAY_URL}{current_route}",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {API_KEY}"
-                },
-                json=payload
+        # Look up repeated questions before going to the gateway, unless a gateway behaviour is being demonstrated
+        if use_cache and UNCACHED_DEMO_MODES.isdisjoint(demo_modes):
+            cache_keys = [
+                response_cache_key(user_query, request_type, deployment, payload.get("model", ""))
+                for request_type in request_types
+            ]
+            misses = [
+                index for index, key in enumerate(cache_keys)
+                if key not in st.session_state.resp_cache
+            ]
+        else:
+            cache_keys = [None] * len(request_types)
+            misses = list(range(len(request_types)))
+        
+        results = {}
+        if misses:
+            # Make requests to AI Gateway; total latency is the slowest route, not the sum
+            responses = st.session_state.event_loop.run_until_complete(
+                dispatch_routes([routes[index] for index in misses], payload)
             )
-            
-            # Calculate latency
-            latency = time.time() - start_time
-            
-            if response.status_code == 200:
-                result = response.json()
-                
-                # Extract metrics
-                token_usage = result.get("usage", {"input_tokens": 0, "output_tokens": 0})
-                st.session_state.token_usage["input"] += token_usage.get("input_tokens", 0)
-                st.session_state.token_usage["output"] += token_usage.get("output_tokens", 0)
-                
-                # Add response to chat
-                assistant_message = {
-                    "role": "assistant", 
-                    "content": result["response"],
-                    "model": result.get("model", "unknown")
-                }
-                st.session_state.messages.append(assistant_message)
-                
-                # Record request history
-                st.session_state.request_history.append({
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
-                    "request_type": query_type,
-                    "model": result.get("model", "unknown"),
-                    "deployment": "Local" if model_deployment == "Local (Ollama)" else "Cloud",
-                    "latency": round(latency, 2),
-                    "input_tokens": token_usage.get("input_tokens", 0),
-                    "output_tokens": token_usage.get("output_tokens", 0)
-                })
-                
-            else:
-                error_msg = f"Error: {response.status_code} - {response.text}"
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
-                
-                # Record error in history
-                st.session_state.request_history.append({
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
-                    "request_type": query_type,
-                    "model": "error",
-                    "deployment": "Local" if model_deployment == "Local (Ollama)" else "Cloud",
-                    "latency": round(latency, 2),
-                    "input_tokens": 0,
-                    "output_tokens": 0
-                })
-                
-        except Exception as e:
-            error_msg = f"Connection error: {str(e)}"
-            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            results = dict(zip(misses, responses))
         
-        # Force UI to update
-        st.experimental_rerun()
+        for index, request_type in enumerate(request_types):
+            if index in results:
+                record_response(request_type, deployment, results[index], cache_keys[index])
+            elif index not in misses:
+                response_text, model, _ = st.session_state.resp_cache[cache_keys[index]]
+                add_message({
+                    "role": "assistant",
+                    "content": response_text,
+                    "model": model,
+                    "cached": True
+                })
 
 with col2:
     st.markdown('<p class="subheader">Gateway Metrics</p>', unsafe_allow_html=True)
     
-    if "Token Usage" in demo_modes and st.session_state.request_history:
+    history = st.session_state.history_cols
+    request_count = len(history["timestamp"])
+    
+    charts = None
+    if request_count and any(mode in demo_modes for mode in CHART_MODES):
+        charts = sync_charts()
+    
+    if "Token Usage" in demo_modes and request_count:
         st.markdown("#### Token Usage Over Time")
-        
-        # Create dataframes for token usage
-        df = pd.DataFrame(st.session_state.request_history)
-        
-        if not df.empty:
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=df["timestamp"],
-                y=df["input_tokens"],
-                name="Input Tokens",
-                marker_color='#3B82F6'
-            ))
-            fig.add_trace(go.Bar(
-                x=df["timestamp"],
-                y=df["output_tokens"],
-                name="Output Tokens",
-                marker_color='#10B981'
-            ))
-            
-            fig.update_layout(
-                barmode='group',
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(charts["tokens"], use_container_width=True, key="token_usage_chart")
     
-    if "Latency Metrics" in demo_modes and st.session_state.request_history:
+    if "Latency Metrics" in demo_modes and request_count:
         st.markdown("#### Latency by Model")
-        
-        df = pd.DataFrame(st.session_state.request_history)
-        
-        if not df.empty:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df["timestamp"],
-                y=df["latency"],
-                mode='lines+markers',
-                name="Latency (s)",
-                marker_color='#F59E0B'
-            ))
-            
-            fig.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                yaxis_title="Seconds",
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(charts["latency"], use_container_width=True, key="latency_chart")
     
-    if "Request Tracing" in demo_modes and st.session_state.request_history:
+    if "Request Tracing" in demo_modes and request_count:
         st.markdown("#### Request Routing")
         
-        df = pd.DataFrame(st.session_state.request_history)
-        
-        if not df.empty and len(df) > 1:
-            # Add deployment visualization
-            deployment_counts = df["deployment"].value_counts().reset_index()
-            deployment_counts.columns = ["Deployment", "Count"]
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=deployment_counts["Deployment"],
-                values=deployment_counts["Count"],
-                hole=.4,
-                marker_colors=['#10B981', '#3B82F6']
-            )])
-            
-            fig.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                title="Cloud vs Local Deployments"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Count request types
-            request_counts = df["request_type"].value_counts().reset_index()
-            request_counts.columns = ["Request Type", "Count"]
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=request_counts["Request Type"],
-                values=request_counts["Count"],
-                hole=.4,
-                marker_colors=['#3B82F6', '#10B981', '#F59E0B', '#EF4444']
-            )])
-            
-            fig.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                title="Request Types"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if request_count > 1:
+            deployment_fig, request_fig = routing_charts(charts)
+            st.plotly_chart(deployment_fig, use_container_width=True, key="deployment_chart")
+            st.plotly_chart(request_fig, use_container_width=True, key="request_type_chart")
     
     # Display raw requests data in an expandable section
-    if st.session_state.request_history:
+    if request_count:
         with st.expander("View Request History"):
-            st.dataframe(pd.DataFrame(st.session_state.request_history))
+            # Expander bodies run even when collapsed, so the table is only built on request
+            if st.toggle("Show request table", key="show_history_table"):
+                st.dataframe(history_frame())
+
+with stats_container:
+    st.metric("Input Tokens Used", st.session_state.token_usage["input"])
+    st.metric("Output Tokens Used", st.session_state.token_usage["output"])
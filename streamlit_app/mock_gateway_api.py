@@ -2,6 +2,7 @@
 Mock Envoy AI Gateway API for development and testing.
 """
 
+import asyncio
 import random
 import time
 import json
@@ -75,10 +76,55 @@ def simulate_token_count(text: str) -> int:
     # Rough approximation: 1 token ≈ 4 characters
     return len(text) // 4
 
-def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_model: str = None) -> Dict[str, Any]:
+# Token counts of the canned responses, computed once at import
+INVESTMENT_RESPONSE_TOKENS = [simulate_token_count(text) for text in INVESTMENT_RESPONSES]
+LOAN_RESPONSE_TOKENS = [simulate_token_count(text) for text in LOAN_RESPONSES]
+CUSTOMER_SERVICE_RESPONSE_TOKENS = [simulate_token_count(text) for text in CUSTOMER_SERVICE_RESPONSES]
+GENERAL_RESPONSE_TOKENS = [simulate_token_count(text) for text in GENERAL_RESPONSES]
+
+# Last route segment -> (canned responses, their token counts, model category)
+ROUTE_TABLE = {
+    "investment": (INVESTMENT_RESPONSES, INVESTMENT_RESPONSE_TOKENS, "investment"),
+    "investment-local": (INVESTMENT_RESPONSES, INVESTMENT_RESPONSE_TOKENS, "investment-local"),
+    "loan": (LOAN_RESPONSES, LOAN_RESPONSE_TOKENS, "loan"),
+    "loan-local": (LOAN_RESPONSES, LOAN_RESPONSE_TOKENS, "loan-local"),
+    "customer": (CUSTOMER_SERVICE_RESPONSES, CUSTOMER_SERVICE_RESPONSE_TOKENS, "customer"),
+    "customer-local": (CUSTOMER_SERVICE_RESPONSES, CUSTOMER_SERVICE_RESPONSE_TOKENS, "customer-local"),
+}
+DEFAULT_ROUTE = (GENERAL_RESPONSES, GENERAL_RESPONSE_TOKENS, "general")
+
+# (model category, original model name) -> the other models in that category to fall back to
+FALLBACK_TABLE = {
+    (category, model["name"]): [other for other in models if other["name"] != model["name"]]
+    for category, models in MODELS.items()
+    for model in models
+}
+
+# Shared generator; each mock response takes all of its random decisions from one draw
+_rng = np.random.default_rng()
+
+# Cached ISO timestamp, refreshed at most once per second: [epoch seconds, iso string]
+_ts_cache = [0.0, ""]
+
+def _now_iso() -> str:
+    """Return the current local time in ISO format, at one-second resolution"""
+    now = time.time()
+    if now - _ts_cache[0] >= 1.0:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+def _request_id() -> str:
+    """Return a random mock request id"""
+    return "req_%d" % _rng.integers(10000, 100000)
+
+async def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_model: str = None) -> Dict[str, Any]:
     """
     Generate a mock response as if it came from the Envoy AI Gateway.
     
+    Simulated latency is awaited rather than slept, so concurrent mock
+    requests overlap on one event loop.
+    
     Args:
         route: API route (/v1/investment, /v1/loan, etc.)
         prompt: User's prompt text
@@ -88,25 +134,18 @@ def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_mod
     Returns:
         Dict containing the mocked API response
     """
-    # Determine query type from route
-    query_type = route.split("/")[-1]
+    # Freeze the enabled modes once for the membership checks below
+    if not isinstance(demo_modes, frozenset):
+        demo_modes = frozenset(demo_modes)
+    
+    # Determine query type from route and select the response set for it
+    query_type = route.rpartition("/")[2]
+    responses, response_tokens, model_category = ROUTE_TABLE.get(query_type, DEFAULT_ROUTE)
     
-    # Select appropriate response set
-    if "investment" in query_type:
-        responses = INVESTMENT_RESPONSES
-        model_category = "investment-local" if "local" in query_type else "investment"
-        model_info = random.choice(MODELS[model_category])
-    elif "loan" in query_type:
-        responses = LOAN_RESPONSES
-        model_category = "loan-local" if "local" in query_type else "loan"
-        model_info = random.choice(MODELS[model_category])
-    elif "customer" in query_type:
-        responses = CUSTOMER_SERVICE_RESPONSES
-        model_category = "customer-local" if "local" in query_type else "customer"
-        model_info = random.choice(MODELS[model_category])
-    else:
-        responses = GENERAL_RESPONSES
-        model_info = random.choice(MODELS["general"])
+    # Draws for model choice, response choice, rate limiting, fallback and fallback choice
+    draws = _rng.random(5).tolist()
+    models = MODELS[model_category]
+    model_info = models[int(draws[0] * len(models))]
     
     # Override model if custom model specified (for Ollama)
     if custom_model and custom_model in OLLAMA_MODELS:
@@ -117,24 +156,25 @@ def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_mod
         }
     
     # Select a response
-    response_text = random.choice(responses)
+    response_index = int(draws[1] * len(responses))
+    response_text = responses[response_index]
     
     # Simulate latency if enabled
     if "Latency Metrics" in demo_modes:
         min_latency, max_latency = model_info["latency_range"]
         simulated_latency = random.uniform(min_latency, max_latency)
-        time.sleep(simulated_latency)
+        await asyncio.sleep(simulated_latency)
     
     # Simulate token usage
     input_tokens = simulate_token_count(prompt)
-    output_tokens = simulate_token_count(response_text)
+    output_tokens = response_tokens[response_index]
     
     # Simulate rate limiting if enabled
     rate_limited = False
     if "Rate Limiting" in demo_modes:
         # 10% chance of rate limiting for cloud models, 3% for local models
         rate_limit_chance = 0.03 if model_info["provider"] == "ollama" else 0.1
-        rate_limited = random.random() < rate_limit_chance
+        rate_limited = draws[2] < rate_limit_chance
     
     if rate_limited:
         return {
@@ -149,13 +189,13 @@ def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_mod
     if "Model Fallback" in demo_modes:
         # 15% chance of fallback for cloud models, 5% for local models
         fallback_chance = 0.05 if model_info["provider"] == "ollama" else 0.15
-        used_fallback = random.random() < fallback_chance
+        used_fallback = draws[3] < fallback_chance
         if used_fallback:
             # Select a different model as fallback
-            model_key = model_category if model_category in MODELS else query_type
-            fallback_options = [m for m in MODELS[model_key] if m["name"] != original_model]
+            # A custom model is not in its category's list, so every model there is a candidate
+            fallback_options = FALLBACK_TABLE.get((model_category, original_model), MODELS[model_category])
             if fallback_options:
-                model_info = random.choice(fallback_options)
+                model_info = fallback_options[int(draws[4] * len(fallback_options))]
     
     # Build the response
     return {
@@ -164,11 +204,15 @@ def get_mock_response(route: str, prompt: str, demo_modes: List[str], custom_mod
         "provider": model_info["provider"],
         "used_fallback": used_fallback,
         "original_model": original_model if used_fallback else None,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "usage": {
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
             "total_tokens": input_tokens + output_tokens
         },
-        "request_id": f"req_{random.randint(10000, 99999)}"
+        "request_id": _request_id()
     }
+
+def get_mock_response_sync(route: str, prompt: str, demo_modes: List[str], custom_model: str = None) -> Dict[str, Any]:
+    """Blocking wrapper around get_mock_response for callers without an event loop"""
+    return asyncio.run(get_mock_response(route, prompt, demo_modes, custom_model))
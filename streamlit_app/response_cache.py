@@ -0,0 +1,27 @@
+"""
+Response cache keys for the Streamlit app.
+
+Kept in an imported module so the normalization cache survives Streamlit reruns.
+"""
+
+import hashlib
+import string
+from functools import lru_cache
+
+# Demo modes whose gateway behaviour must be exercised on every request, so cached answers are bypassed
+UNCACHED_DEMO_MODES = frozenset({"Latency Metrics", "Rate Limiting", "Model Fallback"})
+
+# Punctuation trimmed from the ends of each word; "%" and "$" carry meaning in amounts and are kept
+_EDGE_PUNCTUATION = "".join(char for char in string.punctuation if char not in "%$")
+
+@lru_cache(maxsize=256)
+def normalize_query(query):
+    """Reduce a prompt to a canonical form so near-identical questions share a cache entry"""
+    # Only punctuation around words is dropped, so "5.5%" and "55%" stay distinct
+    words = (word.strip(_EDGE_PUNCTUATION) for word in query.lower().split())
+    return " ".join(word for word in words if word)
+
+def response_cache_key(query, request_type, deployment, model):
+    """Build the response cache key for a query sent to a given route and model"""
+    raw_key = f"{normalize_query(query)}|{request_type}|{deployment}|{model}"
+    return hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,69 @@
+"""
+Static UI data for the Streamlit app.
+
+Kept in an imported module so it is built once per process rather than on every Streamlit rerun.
+"""
+
+import base64
+from pathlib import Path
+from types import MappingProxyType
+
+# Models served locally by Ollama; replies from these get the local model tag
+OLLAMA_MODELS = ["llama3-8b", "mistral-7b", "phi-2", "codellama-7b", "solar-10.7b"]
+LOCAL_MODELS = frozenset(OLLAMA_MODELS)
+
+# (model deployment, query type) to API route
+ROUTE_TABLE = MappingProxyType({
+    ("Cloud APIs", "Investment Advice"): "/v1/investment",
+    ("Cloud APIs", "Loan Calculator"): "/v1/loan",
+    ("Cloud APIs", "Customer Service"): "/v1/customer",
+    ("Cloud APIs", "General Query"): "/v1/general",
+    ("Local (Ollama)", "Investment Advice"): "/v1/investment-local",
+    ("Local (Ollama)", "Loan Calculator"): "/v1/loan-local",
+    ("Local (Ollama)", "Customer Service"): "/v1/customer-local",
+    ("Local (Ollama)", "General Query"): "/v1/general"
+})
+
+# Sidebar logo, embedded as a data URI so page loads need no external image fetch
+LOGO_PATH = Path(__file__).parent / "assets" / "logo.svg"
+LOGO_DATA_URI = "data:image/svg+xml;base64," + base64.b64encode(LOGO_PATH.read_bytes()).decode()
+
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E3A8A;
+    }
+    .subheader {
+        font-size: 1.5rem;
+        color: #3B82F6;
+    }
+    .feature-card {
+        background-color: #F3F4F6;
+        border-radius: 10px;
+        padding: 20px;
+        margin-bottom: 20px;
+    }
+    .info-box {
+        background-color: #FEF3C7;
+        padding: 10px;
+        border-radius: 5px;
+        border-left: 5px solid #F59E0B;
+        margin-bottom: 20px;
+    }
+    .model-tag {
+        background-color: #E0F2FE;
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-size: 0.8rem;
+        margin-right: 5px;
+    }
+    .local-model-tag {
+        background-color: #DCFCE7;
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-size: 0.8rem;
+        margin-right: 5px;
+    }
+</style>
+"""
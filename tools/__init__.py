@@ -4,7 +4,8 @@ from .financial_tools import (
     calculate_investment_returns,
     fetch_stock_price,
     calculate_mortgage_payment,
-    get_exchange_rate
+    get_exchange_rate,
+    get_exchange_rates_batch
 )
 
 __all__ = [
@@ -12,5 +13,6 @@ __all__ = [
     'calculate_investment_returns',
     'fetch_stock_price',
     'calculate_mortgage_payment',
-    'get_exchange_rate'
+    'get_exchange_rate',
+    'get_exchange_rates_batch'
 ]
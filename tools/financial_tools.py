@@ -4,10 +4,13 @@ These tools provide specialized financial functions for the agents.
 """
 
 import numpy as np
-import numpy_financial as npf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-from typing import Dict, List, Union, Optional
+import time
+from functools import lru_cache
+from typing import Dict, List, Union, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 
@@ -16,6 +19,74 @@ STOCK_API_BASE_URL = os.getenv("STOCK_API_URL", "https://api.example.com/stocks"
 FX_API_BASE_URL = os.getenv("FX_API_URL", "https://api.example.com/fx")
 API_KEY = os.getenv("FINANCIAL_API_KEY", "demo-key")
 
+# Shared HTTP session so real API calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+# Mock exchange rates against USD, stored as parallel code and rate arrays
+_CURRENCY_CODES = ('USD', 'EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'CHF', 'CNY', 'INR', 'MXN')
+_RATES = np.array([1.0, 0.93, 0.78, 151.2, 1.37, 1.52, 0.91, 7.25, 83.4, 16.8])
+_CURRENCY_INDEX = {code: i for i, code in enumerate(_CURRENCY_CODES)}
+
+# Random generator for mock market data
+_rng = np.random.default_rng()
+
+# Cached ISO timestamp, refreshed at most once per second: [epoch seconds, iso string]
+_ts_cache = [0.0, ""]
+
+def _now_iso() -> str:
+    """Return the current local time in ISO format, at one-second resolution"""
+    now = time.time()
+    if now - _ts_cache[0] >= 1.0:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+@lru_cache(maxsize=1024)
+def _company_name(ticker_symbol: str) -> str:
+    """Return the mock company name for a ticker"""
+    return f"{ticker_symbol.title()} Inc."
+
+def _pmt(rate, nper, pv):
+    """Return the periodic payment for a loan, signed like numpy_financial.pmt"""
+    if rate == 0:
+        return -pv / nper
+    temp = (1 + rate) ** nper
+    return -(pv * temp) / ((temp - 1) / rate)
+
+def _amortization_schedule(principal, periodic_rate, payment, num_periods):
+    """Return a (3, num_periods) array of principal paid, interest paid and remaining balance"""
+    periods = np.arange(1, num_periods + 1, dtype=np.float64)
+    
+    # Closed form of the balance after k payments
+    if periodic_rate == 0:
+        balances = principal - payment * periods
+    else:
+        growth = (1 + periodic_rate) ** periods
+        balances = principal * growth - payment * (growth - 1) / periodic_rate
+    
+    # Each period's interest accrues on the balance left after the previous payment
+    interest_payments = np.empty_like(balances)
+    interest_payments[:1] = principal * periodic_rate
+    interest_payments[1:] = balances[:-1] * periodic_rate
+    
+    return np.stack((payment - interest_payments, interest_payments, balances))
+
+def _future_value_schedule(initial_value, periodic_rate, period_contribution, periods):
+    """Return the investment value after each period count in `periods` as a float64 array"""
+    periods = np.asarray(periods, dtype=np.float64)
+    
+    if periodic_rate == 0:
+        return initial_value + period_contribution * periods
+    
+    # Closed form of compounding once per period with a contribution at each period end
+    growth = (1 + periodic_rate) ** periods
+    return initial_value * growth + period_contribution * (growth - 1) / periodic_rate
+
 def calculate_loan_payment(
     principal: float,
     annual_interest_rate: float,
@@ -34,6 +105,9 @@ def calculate_loan_payment(
     Returns:
         Dict containing payment amount and amortization schedule
     """
+    if loan_term_years <= 0:
+        raise ValueError("Loan term must be a positive number of years")
+    
     # Convert annual rate to decimal
     rate = annual_interest_rate / 100
     
@@ -51,30 +125,29 @@ def calculate_loan_payment(
         raise ValueError("Payment frequency must be 'monthly', 'biweekly', or 'weekly'")
     
     # Calculate payment amount
-    payment = -npf.pmt(periodic_rate, periods, principal)
+    payment = -_pmt(periodic_rate, periods, principal)
+    
+    # Round the payment figures with np.round, like the schedule, so payment and principal agree
+    payment_amount, total_interest = np.round([payment, (payment * periods) - principal], 2).tolist()
     
     # Generate abbreviated amortization schedule (first 3 payments)
     schedule = []
-    balance = principal
+    preview = np.round(_amortization_schedule(principal, periodic_rate, payment, max(0, min(3, periods))), 2)
     
-    for period in range(1, min(4, periods + 1)):
-        interest_payment = balance * periodic_rate
-        principal_payment = payment - interest_payment
-        balance -= principal_payment
-        
+    for period, (principal_payment, interest_payment, balance) in enumerate(zip(*preview.tolist()), start=1):
         schedule.append({
             "period": period,
-            "payment": round(payment, 2),
-            "principal": round(principal_payment, 2),
-            "interest": round(interest_payment, 2),
-            "balance": round(balance, 2)
+            "payment": payment_amount,
+            "principal": principal_payment,
+            "interest": interest_payment,
+            "balance": balance
         })
     
     return {
-        "payment_amount": round(payment, 2),
+        "payment_amount": payment_amount,
         "payment_frequency": payment_frequency,
         "total_payments": periods,
-        "total_interest": round((payment * periods) - principal, 2),
+        "total_interest": total_interest,
         "amortization_preview": schedule
     }
 
@@ -102,6 +175,9 @@ def calculate_mortgage_payment(
     Returns:
         Dict containing payment details
     """
+    if loan_term_years <= 0:
+        raise ValueError("Loan term must be a positive number of years")
+    
     # Calculate loan amount
     loan_amount = home_price - down_payment
     down_payment_percent = (down_payment / home_price) * 100
@@ -109,7 +185,7 @@ def calculate_mortgage_payment(
     # Calculate base monthly payment (principal + interest)
     monthly_rate = annual_interest_rate / 100 / 12
     num_payments = loan_term_years * 12
-    monthly_pi = -npf.pmt(monthly_rate, num_payments, loan_amount)
+    monthly_pi = -_pmt(monthly_rate, num_payments, loan_amount)
     
     # Calculate taxes and insurance
     monthly_property_tax = (home_price * property_tax_rate / 100) / 12
@@ -135,6 +211,88 @@ def calculate_mortgage_payment(
         "total_payment_over_term": round(total_monthly_payment * num_payments, 2)
     }
 
+def _returns_core(
+    initial_investment: float,
+    monthly_contribution: float,
+    rate: float,
+    periods_per_year: int,
+    investment_period_years: int,
+    compound_frequency: str
+) -> Tuple[Dict[str, Union[float, List[Dict[str, float]]]], float, float]:
+    """Return the pre-tax investment summary with its unrounded total contributions and earnings"""
+    # Calculate periodic rate and total periods
+    periodic_rate = rate / periods_per_year
+    total_periods = investment_period_years * periods_per_year
+    
+    # Calculate contribution per period
+    period_contribution = monthly_contribution * (12 / periods_per_year)
+    
+    # Calculate final value with regular contributions
+    future_value = initial_investment * (1 + periodic_rate) ** total_periods
+    
+    # Calculate future value of periodic contributions
+    # Future value of an annuity formula
+    if periodic_rate > 0:
+        contribution_future_value = period_contribution * ((1 + periodic_rate) ** total_periods - 1) / periodic_rate
+    else:
+        contribution_future_value = period_contribution * total_periods
+    
+    total_future_value = future_value + contribution_future_value
+    total_contributions = initial_investment + (monthly_contribution * 12 * investment_period_years)
+    total_earnings = total_future_value - total_contributions
+    
+    # Generate year-by-year growth summary (for first 5 years)
+    year_end_values = _future_value_schedule(
+        initial_investment,
+        periodic_rate,
+        period_contribution,
+        np.arange(1, min(6, investment_period_years + 1)) * periods_per_year
+    )
+    year_start_values = np.concatenate(([initial_investment], year_end_values))[:-1]
+    yearly_contribution = monthly_contribution * 12
+    yearly_growth = year_end_values - year_start_values - yearly_contribution
+    
+    # Round the computed columns in one pass; each year starts at the previous rounded end value
+    growth_values, end_values = np.round(np.stack([yearly_growth, year_end_values]), 2).tolist()
+    start_values = [round(initial_investment, 2)] + end_values[:-1]
+    contributions = round(yearly_contribution, 2)
+    yearly_summary = [
+        {
+            "year": year,
+            "start_value": start_value,
+            "contributions": contributions,
+            "growth": growth,
+            "end_value": end_value
+        }
+        for year, start_value, growth, end_value in zip(range(1, len(end_values) + 1), start_values, growth_values, end_values)
+    ]
+    
+    result = {
+        "total_future_value": round(total_future_value, 2),
+        "total_contributions": round(total_contributions, 2),
+        "total_earnings": round(total_earnings, 2),
+        "after_tax_earnings": None,
+        "after_tax_future_value": None,
+        "compound_frequency": compound_frequency,
+        "yearly_summary": yearly_summary
+    }
+    return result, total_contributions, total_earnings
+
+def _after_tax_fields(
+    total_contributions: float,
+    total_earnings: float,
+    tax_rate: float
+) -> Dict[str, float]:
+    """Return the after-tax earnings and future value for unrounded investment totals"""
+    tax_rate_decimal = tax_rate / 100
+    after_tax_earnings = total_earnings * (1 - tax_rate_decimal)
+    after_tax_future_value = total_contributions + after_tax_earnings
+    
+    return {
+        "after_tax_earnings": round(after_tax_earnings, 2),
+        "after_tax_future_value": round(after_tax_future_value, 2)
+    }
+
 def calculate_investment_returns(
     initial_investment: float,
     monthly_contribution: float,
@@ -170,67 +328,20 @@ def calculate_investment_returns(
     else:
         raise ValueError("Compound frequency must be 'monthly', 'quarterly', or 'annually'")
     
-    # Calculate periodic rate and total periods
-    periodic_rate = rate / periods_per_year
-    total_periods = investment_period_years * periods_per_year
-    
-    # Calculate contribution per period
-    period_contribution = monthly_contribution * (12 / periods_per_year)
-    
-    # Calculate final value with regular contributions
-    future_value = initial_investment * (1 + periodic_rate) ** total_periods
-    
-    # Calculate future value of periodic contributions
-    # Future value of an annuity formula
-    if periodic_rate > 0:
-        contribution_future_value = period_contribution * ((1 + periodic_rate) ** total_periods - 1) / periodic_rate
-    else:
-        contribution_future_value = period_contribution * total_periods
-    
-    total_future_value = future_value + contribution_future_value
-    total_contributions = initial_investment + (monthly_contribution * 12 * investment_period_years)
-    total_earnings = total_future_value - total_contributions
-    
-    # Calculate after-tax values if tax rate is provided
-    after_tax_earnings = total_earnings
-    after_tax_future_value = total_future_value
+    result, total_contributions, total_earnings = _returns_core(
+        initial_investment,
+        monthly_contribution,
+        rate,
+        periods_per_year,
+        investment_period_years,
+        compound_frequency
+    )
     
+    # Only the taxed path computes the after-tax fields
     if tax_rate is not None:
-        tax_rate_decimal = tax_rate / 100
-        after_tax_earnings = total_earnings * (1 - tax_rate_decimal)
-        after_tax_future_value = total_contributions + after_tax_earnings
+        result.update(_after_tax_fields(total_contributions, total_earnings, tax_rate))
     
-    # Generate year-by-year growth summary (for first 5 years)
-    yearly_summary = []
-    current_value = initial_investment
-    
-    for year in range(1, min(6, investment_period_years + 1)):
-        year_start_value = current_value
-        
-        # Compound through the year
-        for _ in range(periods_per_year):
-            current_value = current_value * (1 + periodic_rate) + period_contribution
-        
-        yearly_contribution = monthly_contribution * 12
-        yearly_growth = current_value - year_start_value - yearly_contribution
-        
-        yearly_summary.append({
-            "year": year,
-            "start_value": round(year_start_value, 2),
-            "contributions": round(yearly_contribution, 2),
-            "growth": round(yearly_growth, 2),
-            "end_value": round(current_value, 2)
-        })
-    
-    return {
-        "total_future_value": round(total_future_value, 2),
-        "total_contributions": round(total_contributions, 2),
-        "total_earnings": round(total_earnings, 2),
-        "after_tax_earnings": round(after_tax_earnings, 2) if tax_rate is not None else None,
-        "after_tax_future_value": round(after_tax_future_value, 2) if tax_rate is not None else None,
-        "compound_frequency": compound_frequency,
-        "yearly_summary": yearly_summary
-    }
+    return result
 
 def fetch_stock_price(
     ticker_symbol: str,
@@ -246,7 +357,7 @@ def fetch_stock_price(
     Returns:
         Dict containing stock price information
     """
-    # In a real implementation, this would call a financial data API
+    # In a real implementation, this would call a financial data API through _SESSION
     # For this demo, we'll generate mock data
     
     # Mock API call for demo purposes
@@ -255,32 +366,37 @@ def fetch_stock_price(
         print(f"Fetching stock data for {ticker_symbol}")
         
         # Generate mock data based on ticker
-        base_price = sum(ord(c) for c in ticker_symbol) % 300 + 50  # Generate a price between $50-$350
+        base_price = sum(ticker_symbol.encode()) % 300 + 50  # Generate a price between $50-$350
         
         # Create mock response
         mock_data = {
             "ticker": ticker_symbol.upper(),
-            "company_name": f"{ticker_symbol.title()} Inc.",
+            "company_name": _company_name(ticker_symbol),
             "current_price": round(base_price, 2),
             "currency": "USD",
-            "change_percent": round((np.random.random() * 6) - 3, 2),  # -3% to +3%
+            "change_percent": round((_rng.random() * 6) - 3, 2),  # -3% to +3%
             "market_cap": round(base_price * (10 ** 9) / 100, 2),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "historical_data": []
         }
         
         # Add historical data points if requested
         if data_points > 1:
-            for i in range(1, data_points):
-                days_ago = i
-                price_modifier = 1 + ((np.random.random() * 0.1) - 0.05)  # -5% to +5% daily change
-                historical_price = round(base_price * price_modifier, 2)
-                
-                mock_data["historical_data"].append({
-                    "date": (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d"),
-                    "price": historical_price,
-                    "volume": int(np.random.random() * 10000000) + 1000000
-                })
+            # One draw per day for the price change and one for the volume
+            draws = _rng.random((data_points - 1, 2))
+            price_modifiers = 1 + (draws[:, 0] * 0.1 - 0.05)  # -5% to +5% daily change
+            historical_prices = np.round(base_price * price_modifiers, 2).tolist()
+            volumes = ((draws[:, 1] * 10000000).astype(np.int64) + 1000000).tolist()
+            
+            now = datetime.now()
+            mock_data["historical_data"] = [
+                {
+                    "date": (now - timedelta(days=days_ago)).strftime("%Y-%m-%d"),
+                    "price": price,
+                    "volume": volume
+                }
+                for days_ago, price, volume in zip(range(1, data_points), historical_prices, volumes)
+            ]
         
         return mock_data
         
@@ -306,22 +422,8 @@ def get_exchange_rate(
     Returns:
         Dict containing exchange rate information
     """
-    # In a real implementation, this would call a currency exchange API
-    # For this demo, we'll generate mock data
-    
-    # Mock exchange rates against USD
-    mock_rates = {
-        'USD': 1.0,
-        'EUR': 0.93,
-        'GBP': 0.78,
-        'JPY': 151.2,
-        'CAD': 1.37,
-        'AUD': 1.52,
-        'CHF': 0.91,
-        'CNY': 7.25,
-        'INR': 83.4,
-        'MXN': 16.8
-    }
+    # In a real implementation, this would call a currency exchange API through _SESSION
+    # For this demo, we'll use the mock rates table
     
     # Normalize currency codes
     from_currency = from_currency.upper()
@@ -329,18 +431,14 @@ def get_exchange_rate(
     
     try:
         # Check if currencies are supported
-        if from_currency not in mock_rates or to_currency not in mock_rates:
+        if from_currency not in _CURRENCY_INDEX or to_currency not in _CURRENCY_INDEX:
             return {
                 "error": True,
-                "message": f"Currency not supported. Supported currencies: {', '.join(mock_rates.keys())}"
+                "message": f"Currency not supported. Supported currencies: {', '.join(_CURRENCY_CODES)}"
             }
         
-        # Calculate exchange rate
-        usd_to_from = mock_rates[from_currency]
-        usd_to_to = mock_rates[to_currency]
-        
         # Calculate rate from from_currency to to_currency
-        rate = usd_to_to / usd_to_from
+        rate = float(_RATES[_CURRENCY_INDEX[to_currency]] / _RATES[_CURRENCY_INDEX[from_currency]])
         converted_amount = amount * rate
         
         return {
@@ -349,7 +447,7 @@ def get_exchange_rate(
             "exchange_rate": round(rate, 6),
             "amount": amount,
             "converted_amount": round(converted_amount, 2),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
     except Exception as e:
@@ -357,3 +455,51 @@ def get_exchange_rate(
             "error": True,
             "message": f"Failed to get exchange rate: {str(e)}"
         }
+
+def get_exchange_rates_batch(
+    from_currency: str,
+    to_currencies: List[str],
+    amount: float = 1.0
+) -> Dict[str, Union[float, str, Dict[str, float]]]:
+    """
+    Convert an amount from one currency into several target currencies.
+    
+    Args:
+        from_currency: Source currency code (e.g., 'USD')
+        to_currencies: Target currency codes (e.g., ['EUR', 'JPY'])
+        amount: Amount to convert
+        
+    Returns:
+        Dict containing the exchange rate and converted amount per target currency
+    """
+    # Normalize currency codes
+    from_currency = from_currency.upper()
+    to_currencies = [code.upper() for code in to_currencies]
+    
+    try:
+        # Check if currencies are supported
+        unsupported = [code for code in [from_currency, *to_currencies] if code not in _CURRENCY_INDEX]
+        if unsupported:
+            return {
+                "error": True,
+                "message": f"Currency not supported: {', '.join(unsupported)}. Supported currencies: {', '.join(_CURRENCY_CODES)}"
+            }
+        
+        # All target rates in one vectorized division
+        rates = _RATES[[_CURRENCY_INDEX[code] for code in to_currencies]] / _RATES[_CURRENCY_INDEX[from_currency]]
+        rounded_rates = np.round(rates, 6).tolist()
+        converted_amounts = np.round(rates * amount, 2).tolist()
+        
+        return {
+            "from_currency": from_currency,
+            "amount": amount,
+            "exchange_rates": dict(zip(to_currencies, rounded_rates)),
+            "converted_amounts": dict(zip(to_currencies, converted_amounts)),
+            "timestamp": _now_iso()
+        }
+        
+    except Exception as e:
+        return {
+            "error": True,
+            "message": f"Failed to get exchange rates: {str(e)}"
+        }